@@ -1,18 +1,56 @@
 #!/usr/bin/env python3
 """InvokeAI Models Viewer - Terminal UI for browsing and filtering InvokeAI models."""
 
+import os
 import sqlite3
-import json
+import sys
 import yaml
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List
 
 import pyperclip
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Header, Footer, DataTable, Input, Static, Label
 from textual.binding import Binding
-from textual.reactive import reactive
+
+# Delay between the last keystroke and re-filtering the table
+FILTER_DEBOUNCE_SECONDS = 0.12
+
+# Adding a DataTable row costs roughly this many times a single row's
+# re-indexing during remove_row
+ROW_REMOVE_COST_RATIO = 16
+
+
+class ModelColumns:
+    """Model metadata stored as parallel lists, one entry per model index."""
+
+    # Attributes holding per-model lists, kept in step by sort_by_name()
+    _COLUMNS = ("names", "types", "subtypes", "paths", "names_lower", "types_lower", "subtypes_lower")
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.types: List[str] = []
+        self.subtypes: List[str] = []
+        self.paths: List[str] = []
+        # Lowercase filter/sort keys, computed once instead of per keystroke
+        self.names_lower: List[str] = []
+        self.types_lower: List[str] = []
+        self.subtypes_lower: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lower_column(self, field: str) -> List[str]:
+        """Return the lowercase key list for a display field (name/type/subtype)."""
+        return getattr(self, f"{field}s_lower")
+
+    def sort_by_name(self) -> None:
+        """Reorder every column by lowercase display name (stable)."""
+        order = sorted(range(len(self)), key=self.names_lower.__getitem__)
+        for attr in self._COLUMNS:
+            values = getattr(self, attr)
+            setattr(self, attr, list(map(values.__getitem__, order)))
 
 
 class ModelDatabase:
@@ -20,57 +58,66 @@ class ModelDatabase:
 
     def __init__(self, db_path: Path):
         self.db_path = db_path
-        self._models = []
-
-    def load_models(self) -> List[Dict[str, Any]]:
+        self._models = ModelColumns()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared connection, opening it on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the shared connection if it is open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load_models(self) -> ModelColumns:
         """Load all models from the database."""
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database not found at: {self.db_path}")
 
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-
+            cursor = self._connect().cursor()
             cursor.execute(
                 """
                 SELECT
                     json_extract(config, '$.name') AS model_name,
                     json_extract(config, '$.type') AS model_type,
                     json_extract(config, '$.base') AS model_base,
-                    json_extract(config, '$.trigger_phrases') AS trigger_phrases,
                     json_extract(config, '$.path') AS model_path
                 FROM models
                 ORDER BY model_name COLLATE NOCASE ASC
                 """
             )
-            rows = cursor.fetchall()
-            conn.close()
-
-            models = []
-            for row in rows:
-                model_name, model_type, model_base, trigger_phrases_json, model_path = row
-
-                # Parse trigger phrases
-                triggers = []
-                if trigger_phrases_json:
-                    try:
-                        triggers = json.loads(trigger_phrases_json)
-                        if not isinstance(triggers, list):
-                            triggers = [str(triggers)]
-                    except (json.JSONDecodeError, TypeError):
-                        triggers = []
+
+            # Iterate the cursor directly so rows stream into the column lists
+            # instead of being materialized all at once by fetchall()
+            models = ModelColumns()
+            for row in cursor:
+                model_name, model_type, model_base, model_path = row
 
                 # Extract file extension from path and append to name
                 ext = Path(model_path).suffix if model_path else ""
                 display_name = f"{model_name or 'Unknown'}{ext}"
 
-                models.append({
-                    "name": display_name,
-                    "type": model_type or "Unknown",
-                    "subtype": model_base or "Unknown",
-                    "triggers": ", ".join(triggers) if triggers else "",
-                    "path": model_path or "",
-                })
+                # Types and bases come from a handful of values; intern them so
+                # every row shares one string object per distinct value
+                model_type = sys.intern(model_type or "Unknown")
+                model_base = sys.intern(model_base or "Unknown")
+
+                models.names.append(display_name)
+                models.types.append(model_type)
+                models.subtypes.append(model_base)
+                models.paths.append(model_path or "")
+                models.names_lower.append(display_name.lower())
+                models.types_lower.append(sys.intern(model_type.lower()))
+                models.subtypes_lower.append(sys.intern(model_base.lower()))
+
+            # SQLite's NOCASE order only folds ASCII and ignores the extension, so
+            # settle on the app's own name order; the SQL presort keeps this cheap
+            models.sort_by_name()
 
             self._models = models
             return models
@@ -191,19 +238,24 @@ class InvokeAIViewer(App):
 
     TITLE = "InvokeAI Models Viewer"
 
-    # Reactive filters
-    filter_name = reactive("")
-    filter_type = reactive("")
-    filter_subtype = reactive("")
-
     def __init__(self):
         super().__init__()
         self.data_path, self.db_path = load_config()
+        self._models_root = str(self.data_path / "models")
         self.db = ModelDatabase(self.db_path)
-        self.all_models = []
-        self.filtered_models = []
+        self.all_models = ModelColumns()
+        # Plain attributes: on_input_changed already schedules apply_filters
+        self.filter_name = ""
+        self.filter_type = ""
+        self.filter_subtype = ""
+        self.filtered_indices: List[int] = []
         self.sort_column = "name"  # Default sort by name
         self.sort_reverse = False
+        self._filter_timer = None
+        self._last_filter_key = None
+        self._source_sorted_by = None
+        self._rendered_keys = set()
+        self._loading = False
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -227,25 +279,50 @@ class InvokeAIViewer(App):
 
     def on_mount(self) -> None:
         """Initialize the app after mounting."""
+        # Cache widget references so per-keystroke updates skip DOM queries
+        self._table = self.query_one("#models_table", DataTable)
+        self._status = self.query_one("#status_text", Static)
+        self._inputs = {
+            field: self.query_one(f"#input_{field}", Input)
+            for field in ("name", "type", "subtype")
+        }
+
         # Setup table with fixed column widths
-        table = self.query_one("#models_table", DataTable)
+        table = self._table
         table.add_column("Model ▼", width=120)
         table.add_column("Type", width=24)
         table.add_column("Base Model", width=16)
         table.cursor_type = "row"
 
-        # Load models
+        # Load models off the UI thread; the table fills in when they arrive
+        self._loading = True
+        self.run_worker(self._load_models, thread=True, exclusive=True)
+
+    def _load_models(self) -> None:
+        """Load models in a worker thread and hand them to the UI thread."""
         try:
-            self.all_models = self.db.load_models()
-            self.filtered_models = self.all_models.copy()
-            self.update_table()
-            self.update_status()
+            models = self.db.load_models()
         except Exception as e:
-            self.update_status_text(f"Error loading models: {e}", error=True)
+            self.call_from_thread(self.update_status_text, f"Error loading models: {e}", error=True)
+            return
+
+        self.call_from_thread(self._on_models_loaded, models)
+
+    def _on_models_loaded(self, models: ModelColumns) -> None:
+        """Show freshly loaded models, honoring any filters typed while loading."""
+        self.all_models = models
+        self._loading = False
+        self._source_sorted_by = ("name", False)
+        self._last_filter_key = None
+        self.apply_filters()
+
+    def on_unmount(self) -> None:
+        """Release the database connection when the app shuts down."""
+        self.db.close()
 
     def on_data_table_header_selected(self, event) -> None:
         """Handle column header clicks for sorting."""
-        table = self.query_one("#models_table", DataTable)
+        table = self._table
 
         # Map column index to field name
         column_map = {0: "name", 1: "type", 2: "subtype"}
@@ -268,6 +345,7 @@ class InvokeAIViewer(App):
 
         # Clear and re-add columns with consistent widths
         table.clear(columns=True)
+        self._rendered_keys = set()
         table.add_column(headers[0], width=120)  # Model
         table.add_column(headers[1], width=24)   # Type
         table.add_column(headers[2], width=16)   # Base Model
@@ -286,44 +364,98 @@ class InvokeAIViewer(App):
         elif input_id == "input_subtype":
             self.filter_subtype = event.value.lower()
 
-        self.apply_filters()
+        # Debounce: coalesce a burst of keystrokes into a single refresh
+        if self._filter_timer is not None:
+            self._filter_timer.stop()
+        self._filter_timer = self.set_timer(FILTER_DEBOUNCE_SECONDS, self.apply_filters)
 
     def apply_filters(self) -> None:
         """Apply all active filters to the model list."""
-        filtered = self.all_models.copy()
-
-        if self.filter_name:
-            filtered = [m for m in filtered if self.filter_name in m["name"].lower()]
+        # Until the models arrive, keep the loading (or error) message; the
+        # filter values are already stored and _on_models_loaded applies them
+        if self._loading:
+            return
 
-        if self.filter_type:
-            filtered = [m for m in filtered if self.filter_type in m["type"].lower()]
+        models = self.all_models
 
-        if self.filter_subtype:
-            filtered = [m for m in filtered if self.filter_subtype in m["subtype"].lower()]
+        # Collect the active (lowercase column, query) pairs
+        active = [
+            (models.lower_column(field), value)
+            for field, value in (
+                ("name", self.filter_name),
+                ("type", self.filter_type),
+                ("subtype", self.filter_subtype),
+            )
+            if value
+        ]
+
+        # If every query only got longer, the new matches are a subset of the
+        # current ones, so narrow the previous result instead of rescanning
+        filter_key = ((self.filter_name, self.filter_type, self.filter_subtype),
+                      (self.sort_column, self.sort_reverse))
+        source = range(len(models))
+        source_sorted_by = self._source_sorted_by
+        if self._last_filter_key is not None:
+            prev_filters, prev_sort = self._last_filter_key
+            if prev_sort == filter_key[1] and all(
+                prev in new for prev, new in zip(prev_filters, filter_key[0])
+            ):
+                source = self.filtered_indices
+                source_sorted_by = prev_sort
+
+        # One plain substring test per row and field; each pass scans only
+        # the survivors of the previous one (no per-row generator). The first
+        # pass reads the source directly rather than a copy of it.
+        if active:
+            filtered = source
+            for column, value in active:
+                filtered = [i for i in filtered if value in column[i]]
+        else:
+            filtered = list(source)
 
-        # Sort the filtered results
-        filtered.sort(key=lambda x: x[self.sort_column].lower(), reverse=self.sort_reverse)
+        # Sort the filtered indices on the cached lowercase keys. Filtering keeps
+        # the source order, so skip the sort when the source is already ordered
+        # the way the table wants it.
+        if source_sorted_by != filter_key[1]:
+            sort_keys = models.lower_column(self.sort_column)
+            filtered.sort(key=sort_keys.__getitem__, reverse=self.sort_reverse)
 
-        self.filtered_models = filtered
+        self.filtered_indices = filtered
+        self._last_filter_key = filter_key
         self.update_table()
         self.update_status()
 
     def update_table(self) -> None:
         """Update the DataTable with filtered models."""
-        table = self.query_one("#models_table", DataTable)
+        table = self._table
+        new_keys = set(self.filtered_indices)
+
+        # A narrowed result keeps the rendered order, so drop just the rows that
+        # no longer match. remove_row re-indexes every remaining row, so only do
+        # this while it is cheaper than rebuilding the table.
+        if new_keys <= self._rendered_keys:
+            removed = self._rendered_keys - new_keys
+            if len(removed) * len(self._rendered_keys) <= ROW_REMOVE_COST_RATIO * len(new_keys):
+                for index in removed:
+                    table.remove_row(str(index))
+                self._rendered_keys = new_keys
+                return
+
+        models = self.all_models
         table.clear()
-
-        for model in self.filtered_models:
+        for index in self.filtered_indices:
             table.add_row(
-                model["name"],
-                model["type"],
-                model["subtype"]
+                models.names[index],
+                models.types[index],
+                models.subtypes[index],
+                key=str(index)
             )
+        self._rendered_keys = new_keys
 
     def update_status(self) -> None:
         """Update the status bar with current filter stats."""
         total = len(self.all_models)
-        filtered = len(self.filtered_models)
+        filtered = len(self.filtered_indices)
 
         if filtered == total:
             msg = f"Showing all {total} models | Database: {self.db_path}"
@@ -334,7 +466,7 @@ class InvokeAIViewer(App):
 
     def update_status_text(self, text: str, error: bool = False) -> None:
         """Update the status text widget."""
-        status = self.query_one("#status_text", Static)
+        status = self._status
         status.update(text)
         if error:
             status.styles.color = "red"
@@ -343,13 +475,12 @@ class InvokeAIViewer(App):
 
     def action_focus_filter(self) -> None:
         """Focus the first filter field (hotkey: F)."""
-        self.query_one("#input_name", Input).focus()
+        self._inputs["name"].focus()
 
     def action_reset_filters(self) -> None:
         """Reset all filters (hotkey: R)."""
-        self.query_one("#input_name", Input).value = ""
-        self.query_one("#input_type", Input).value = ""
-        self.query_one("#input_subtype", Input).value = ""
+        for filter_input in self._inputs.values():
+            filter_input.value = ""
 
         self.filter_name = ""
         self.filter_type = ""
@@ -360,27 +491,27 @@ class InvokeAIViewer(App):
 
     def action_generate_symlinks(self) -> None:
         """Generate symlink commands and copy to clipboard (hotkey: S)."""
-        if not self.filtered_models:
+        if not self.filtered_indices:
             self.update_status_text("No models to generate symlinks for", error=True)
             return
 
-        symlinks = []
-        for model in self.filtered_models:
-            model_path = model["path"]
-            if model_path and model_path.strip():
-                # Construct full path: data_path / models / path
-                # Structure: /mnt/llm/hub/invokeai_data/models/{UUID}/{filename}
-                full_path = self.data_path / "models" / model_path
-                symlinks.append(f'ln -s "{full_path}" .')
+        # Construct full path: data_path / models / path
+        # Structure: /mnt/llm/hub/invokeai_data/models/{UUID}/{filename}
+        # os.path.join on the cached root string avoids building a Path per model
+        # and still honors absolute model paths.
+        paths = self.all_models.paths
+        symlinks = [
+            f'ln -s "{os.path.join(self._models_root, model_path)}" .'
+            for model_path in map(paths.__getitem__, self.filtered_indices)
+            if model_path and model_path.strip()
+        ]
 
         if not symlinks:
             self.update_status_text("No valid model paths found", error=True)
             return
 
-        symlink_text = "\n".join(symlinks)
-
         try:
-            pyperclip.copy(symlink_text)
+            pyperclip.copy("\n".join(symlinks))
             count = len(symlinks)
             self.update_status_text(f"✓ Copied {count} symlink command{'s' if count > 1 else ''} to clipboard!")
         except Exception as e: